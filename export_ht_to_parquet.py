@@ -20,6 +20,11 @@ Export a large, keyed Hail Table of variant rows (e.g. gnomAD sites) to a Parque
   - To preserve that locality, this script avoids dataset-wide shuffles and writes contig-by-contig via
     `hl.filter_intervals(...)` on the keyed Hail Table.
 
+With `--manifest`, each contig directory also gets a `_manifest.json` listing every Parquet file with
+its min/max `position` and row count, so clients (e.g. on gs://) can pick the files overlapping a query
+from a single read rather than opening every file footer:
+    {"files": {"part-00000-....parquet": {"min": 10001, "max": 2781479, "num_rows": 2000000}, ...}}
+
 Output columns (per row):
   - position: int32
   - alleles: array<str>
@@ -42,26 +47,37 @@ DuckDB usage (partition pruning + row-group pruning):
   ...   \"\"\"
   ... ).fetchall()
 
-Polars usage (lazy scan; pass hive_partitioning=True):
+Polars usage (lazy scan; glob the .parquet files so non-Parquet files such as `_manifest.json` are
+skipped, and pass hive_partitioning=True):
   >>> import polars as pl
-  >>> lf = pl.scan_parquet("parquet_out", hive_partitioning=True)
+  >>> lf = pl.scan_parquet("parquet_out/**/*.parquet", hive_partitioning=True)
   >>> lf.filter((pl.col("contig") == "chr1") & (pl.col("position") == 205000000)).select(
   ...     "position", "alleles", "VRS_Error"
   ... ).collect()
 
 Notes:
+- Row groups default to 16MiB (`--row-group-size`) rather than Spark's ~128MiB so that each row group's
+  (min(position), max(position)) range stays narrow and point queries read less data.
+- Files are capped at 2M records (`--max-records-per-file`), i.e. file_rows ~= 8 x row_group_rows at the
+  default row group size: enough row groups per file for position pruning without tiny-file overhead,
+  and always several files per large contig for parallel reads.
 - You should filter on `contig` (directory partition) and `position` (row-group stats) for best performance.
-- `--sort-within-partitions` can improve row-group pruning if you observe wide position ranges per file,
-  but it may increase local spill during the write.
+- Rows are sorted by `position` within each Spark partition before writing (disable with
+  `--no-sort-within-partitions`). Partitions of the keyed Hail table already cover ordered, disjoint
+  locus ranges, so this yields monotonic, non-overlapping row-group min/max without a shuffle.
 """
 
 from __future__ import annotations
 
 import argparse
+import importlib.util
+import json
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import hail as hl
+from pyspark.sql import functions as F
 
 
 def _init_hail(
@@ -71,6 +87,8 @@ def _init_hail(
     driver_memory: str | None,
     executor_memory: str | None,
     parquet_compression: str,
+    row_group_size: int,
+    page_size: int,
 ):
     spark_local_dir.mkdir(parents=True, exist_ok=True)
     tmp_dir.mkdir(parents=True, exist_ok=True)
@@ -78,6 +96,12 @@ def _init_hail(
     spark_conf: dict[str, str] = {
         "spark.local.dir": str(spark_local_dir),
         "spark.sql.parquet.compression.codec": parquet_compression,
+        # Lets concurrently submitted contig exports share the cluster instead of queueing FIFO.
+        "spark.scheduler.mode": "FAIR",
+        # Spark's default row group (~128MiB) is too coarse for point/range lookups on `position`;
+        # smaller row groups give tighter min/max stats so readers can skip more of each file.
+        "spark.hadoop.parquet.block.size": str(row_group_size),
+        "spark.hadoop.parquet.page.size": str(page_size),
     }
     if driver_memory:
         spark_conf["spark.driver.memory"] = driver_memory
@@ -103,11 +127,20 @@ def _parse_contigs(contigs_arg: list[str] | None) -> list[str]:
     return contigs
 
 
+# Array columns that must be stored as int32 (positions fit easily; int64 would double their bytes).
+_INT32_ARRAY_COLUMNS = (
+    "VRS_Starts",
+    "VRS_Ends",
+    "VRS_Lengths",
+    "VRS_RepeatSubunitLengths",
+)
+
+
 def _flatten_for_parquet(ht: hl.Table) -> hl.Table:
     # Drop the key so we can drop Hail's `locus` field and flatten structs freely.
     ht = ht.key_by()
     return ht.select(
-        position=ht.locus.position,
+        position=hl.int32(ht.locus.position),
         alleles=ht.alleles,
         VRS_Allele_IDs=ht.info.VRS_Allele_IDs,
         VRS_Error=ht.info.VRS_Error,
@@ -119,6 +152,91 @@ def _flatten_for_parquet(ht: hl.Table) -> hl.Table:
     )
 
 
+def _write_contig_arrow(
+    ht_flat: hl.Table,
+    out_contig_dir: Path,
+    *,
+    compression: str,
+    row_group_size: int,
+    page_size: int,
+) -> None:
+    """
+    Write a (small) flattened contig table to a single Parquet file via pandas + PyArrow.
+
+    This skips the Hail -> Spark DataFrame conversion entirely, but collects the whole contig on the
+    driver, so it is only appropriate for small contigs (e.g. chrY, chrM).
+    """
+    try:
+        import pyarrow as pa  # type: ignore[import-not-found]
+        import pyarrow.parquet as pq  # type: ignore[import-not-found]
+    except ImportError as e:
+        raise SystemExit("--writer arrow requires pyarrow: pip install pyarrow") from e
+
+    table = pa.Table.from_pandas(ht_flat.to_pandas(), preserve_index=False)
+    # pandas round-trips ints as int64; restore the int32 output schema.
+    for name in ("position", *_INT32_ARRAY_COLUMNS):
+        idx = table.schema.get_field_index(name)
+        target = pa.int32() if name == "position" else pa.list_(pa.int32())
+        table = table.set_column(idx, name, table.column(name).cast(target))
+    table = table.sort_by("position")
+
+    # PyArrow sizes row groups in rows, not bytes; approximate the byte target from the average row width.
+    row_bytes = max(1, table.nbytes // max(1, table.num_rows))
+    rows_per_group = max(1, row_group_size // row_bytes)
+
+    out_contig_dir.mkdir(parents=True, exist_ok=True)
+    pq.write_table(
+        table,
+        str(out_contig_dir / "part-00000.parquet"),
+        compression=compression,
+        row_group_size=rows_per_group,
+        data_page_size=page_size,
+    )
+    # Match Spark's completion marker so --resume works for either writer.
+    (out_contig_dir / "_SUCCESS").touch()
+
+
+def _write_contig_manifest(out_contig_dir: Path) -> None:
+    """
+    Write `<out_contig_dir>/_manifest.json` mapping each Parquet file to its `position` range.
+
+    Clients can prune files for point/range queries from this one small file instead of opening every
+    Parquet footer (one request per file on gs://). Paths are relative to the contig directory.
+    """
+    # pyarrow availability is checked once in main() before any contig is exported.
+    import pyarrow.parquet as pq  # type: ignore[import-not-found]
+
+    files: dict[str, dict[str, int | None]] = {}
+    for path in sorted(out_contig_dir.rglob("*.parquet")):
+        metadata = pq.read_metadata(path)
+        pos_min: int | None = None
+        pos_max: int | None = None
+        for rg_idx in range(metadata.num_row_groups):
+            rg = metadata.row_group(rg_idx)
+            stats = next(
+                (
+                    rg.column(i).statistics
+                    for i in range(rg.num_columns)
+                    if rg.column(i).path_in_schema == "position"
+                ),
+                None,
+            )
+            if stats is None or not stats.has_min_max:
+                # Unknown range for this file; readers must not prune it.
+                pos_min = pos_max = None
+                break
+            pos_min = stats.min if pos_min is None else min(pos_min, stats.min)
+            pos_max = stats.max if pos_max is None else max(pos_max, stats.max)
+        files[str(path.relative_to(out_contig_dir))] = {
+            "min": pos_min,
+            "max": pos_max,
+            "num_rows": metadata.num_rows,
+        }
+
+    with open(out_contig_dir / "_manifest.json", "w") as f:
+        json.dump({"files": files}, f, indent=1)
+
+
 def _success_file_exists(path: Path) -> bool:
     return (path / "_SUCCESS").is_file()
 
@@ -144,6 +262,94 @@ def _ensure_empty_output_dir(path: Path, *, overwrite: bool, resume: bool) -> bo
     )
 
 
+def _export_contig(
+    ht: hl.Table,
+    contig: str,
+    interval: hl.expr.IntervalExpression,
+    *,
+    out_root: Path,
+    args: argparse.Namespace,
+) -> None:
+    out_contig_dir = out_root / f"contig={contig}"
+    if not _ensure_empty_output_dir(
+        out_contig_dir, overwrite=args.overwrite, resume=args.resume
+    ):
+        return
+
+    print(f"Exporting contig: {contig}")
+    if args.parallel_contigs > 1:
+        # Give each contig its own FAIR scheduler pool so concurrent contigs share executors evenly.
+        hl.spark_context().setLocalProperty("spark.scheduler.pool", contig)
+    ht_contig = hl.filter_intervals(ht, [interval])
+
+    # Preflight: useful for ensuring we'll generate multiple files per contig without assuming
+    # a strict 1-partition == 1-file mapping. Logging only, and it forces Hail to resolve the
+    # filtered partitioner, so only do it when asked.
+    if args.verbose:
+        try:
+            hail_parts = ht_contig.n_partitions()
+        except Exception:
+            hail_parts = None
+        if hail_parts is not None:
+            print(f"{contig}: Hail partitions after filter: {hail_parts}")
+
+    ht_flat = _flatten_for_parquet(ht_contig)
+    if args.writer == "arrow":
+        _write_contig_arrow(
+            ht_flat,
+            out_contig_dir,
+            compression=args.compression,
+            row_group_size=args.row_group_size,
+            page_size=args.page_size,
+        )
+        if args.manifest:
+            _write_contig_manifest(out_contig_dir)
+        print(f"Wrote: {out_contig_dir}")
+        return
+
+    df = ht_flat.to_spark()
+    # Guard against Spark widening ints to long so position stats and columns stay int32.
+    df = df.withColumn("position", F.col("position").cast("int"))
+    for name in _INT32_ARRAY_COLUMNS:
+        df = df.withColumn(name, F.col(name).cast("array<int>"))
+    spark_parts = df.rdd.getNumPartitions()
+    print(f"{contig}: Spark partitions before write: {spark_parts}")
+
+    if (
+        args.max_files_per_contig is not None
+        and spark_parts > args.max_files_per_contig
+    ):
+        print(f"{contig}: coalesce -> {args.max_files_per_contig}")
+        df = df.coalesce(args.max_files_per_contig)
+        # Target is known; avoid another df.rdd round-trip just to read it back.
+        spark_parts = args.max_files_per_contig
+
+    if (
+        args.min_files_per_contig is not None
+        and spark_parts < args.min_files_per_contig
+    ):
+        print(
+            f"{contig}: repartitionByRange -> {args.min_files_per_contig} (shuffle, contig-scoped)"
+        )
+        df = df.repartitionByRange(args.min_files_per_contig, "position")
+        spark_parts = args.min_files_per_contig
+
+    if args.sort_within_partitions:
+        df = df.sortWithinPartitions("position")
+
+    writer = (
+        df.write.mode("overwrite")
+        .option("compression", args.compression)
+        .option("parquet.block.size", str(args.row_group_size))
+        .option("maxRecordsPerFile", args.max_records_per_file)
+    )
+
+    writer.parquet(str(out_contig_dir))
+    if args.manifest:
+        _write_contig_manifest(out_contig_dir)
+    print(f"Wrote: {out_contig_dir}")
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="Export a keyed Hail Table to Hive-partitioned Parquet by contig."
@@ -174,10 +380,36 @@ def main() -> int:
         default="zstd",
         help="Parquet compression codec (default: zstd).",
     )
+    parser.add_argument(
+        "--row-group-size",
+        type=int,
+        default=16 * 1024 * 1024,
+        help="Target Parquet row group size in bytes (default: 16MiB).",
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=64 * 1024,
+        help="Target Parquet page size in bytes (default: 64KiB).",
+    )
+    parser.add_argument(
+        "--writer",
+        choices=["spark", "arrow"],
+        default="spark",
+        help=(
+            "Parquet writer (default: spark). 'arrow' bypasses the Spark DataFrame conversion and writes "
+            "one file per contig with PyArrow; it collects each contig on the driver, so use it only "
+            "for small contigs."
+        ),
+    )
     parser.add_argument(
         "--sort-within-partitions",
-        action="store_true",
-        help="Sort within Spark partitions by position before writing (may increase local spill).",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help=(
+            "Sort within Spark partitions by position before writing (default: on). Input is already "
+            "near-sorted by locus, so this is cheap and keeps row-group position ranges tight."
+        ),
     )
     parser.add_argument(
         "--max-files-per-contig",
@@ -197,8 +429,27 @@ def main() -> int:
     parser.add_argument(
         "--max-records-per-file",
         type=int,
-        default=None,
-        help="Spark Parquet writer option to cap records per file.",
+        default=2_000_000,
+        help=(
+            "Spark Parquet writer option to cap records per file (default: 2000000; 0 disables). "
+            "Sized so each file holds roughly 8 row groups at the default --row-group-size."
+        ),
+    )
+    parser.add_argument(
+        "--parallel-contigs",
+        type=int,
+        default=1,
+        help="Number of contigs to export concurrently (default: 1).",
+    )
+    parser.add_argument(
+        "--manifest",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help=(
+            "Write contig=<c>/_manifest.json with per-file position min/max for client-side file "
+            "pruning (default: off; requires pyarrow). Polars directory scans then need a "
+            "'**/*.parquet' glob."
+        ),
     )
     parser.add_argument(
         "--overwrite",
@@ -210,6 +461,11 @@ def main() -> int:
         action="store_true",
         help="Skip contigs whose output directory already contains a _SUCCESS marker.",
     )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Log extra per-contig diagnostics (e.g. Hail partition count after filtering).",
+    )
     parser.add_argument(
         "--driver-memory", default="6g", help="Spark driver memory (e.g. 6g)."
     )
@@ -227,6 +483,14 @@ def main() -> int:
         help="Spark local dir (default: ~/tmp/spark-local).",
     )
     args = parser.parse_args()
+    if args.parallel_contigs < 1:
+        parser.error("--parallel-contigs must be >= 1")
+    if args.manifest:
+        # Fail before the (long) export rather than after the first contig is written.
+        if importlib.util.find_spec("pyarrow") is None:
+            raise SystemExit(
+                "Writing _manifest.json requires pyarrow: pip install pyarrow (or drop --manifest)"
+            )
 
     out_root = Path(args.out)
     out_root.mkdir(parents=True, exist_ok=True)
@@ -237,6 +501,8 @@ def main() -> int:
         driver_memory=args.driver_memory,
         executor_memory=args.executor_memory,
         parquet_compression=args.compression,
+        row_group_size=args.row_group_size,
+        page_size=args.page_size,
     )
 
     contigs = _parse_contigs(args.contigs)
@@ -267,60 +533,25 @@ def main() -> int:
             f"Input table is missing expected fields: {', '.join(missing)}"
         )
 
-    for contig in contigs:
-        out_contig_dir = out_root / f"contig={contig}"
-        if not _ensure_empty_output_dir(
-            out_contig_dir, overwrite=args.overwrite, resume=args.resume
-        ):
-            continue
-
-        print(f"Exporting contig: {contig}")
-        interval = hl.parse_locus_interval(contig, reference_genome=args.reference)
-        ht_contig = hl.filter_intervals(ht, [interval])
-
-        # Preflight: useful for ensuring we'll generate multiple files per contig without assuming
-        # a strict 1-partition == 1-file mapping.
-        try:
-            hail_parts = ht_contig.n_partitions()
-        except Exception:
-            hail_parts = None
-        if hail_parts is not None:
-            print(f"{contig}: Hail partitions after filter: {hail_parts}")
+    intervals_by_contig = {
+        contig: hl.parse_locus_interval(contig, reference_genome=args.reference)
+        for contig in contigs
+    }
 
-        ht_flat = _flatten_for_parquet(ht_contig)
-        df = ht_flat.to_spark()
-        spark_parts = df.rdd.getNumPartitions()
-        print(f"{contig}: Spark partitions before write: {spark_parts}")
-
-        if (
-            args.max_files_per_contig is not None
-            and spark_parts > args.max_files_per_contig
-        ):
-            print(f"{contig}: coalesce -> {args.max_files_per_contig}")
-            df = df.coalesce(args.max_files_per_contig)
-            spark_parts = df.rdd.getNumPartitions()
-            print(f"{contig}: Spark partitions after coalesce: {spark_parts}")
-
-        if (
-            args.min_files_per_contig is not None
-            and spark_parts < args.min_files_per_contig
-        ):
-            print(
-                f"{contig}: repartitionByRange -> {args.min_files_per_contig} (shuffle, contig-scoped)"
+    # Contigs are independent with disjoint output directories, so they can be written concurrently.
+    with ThreadPoolExecutor(max_workers=args.parallel_contigs) as pool:
+        list(
+            pool.map(
+                lambda contig: _export_contig(
+                    ht,
+                    contig,
+                    intervals_by_contig[contig],
+                    out_root=out_root,
+                    args=args,
+                ),
+                contigs,
             )
-            df = df.repartitionByRange(args.min_files_per_contig, "position")
-            spark_parts = df.rdd.getNumPartitions()
-            print(f"{contig}: Spark partitions after repartitionByRange: {spark_parts}")
-
-        if args.sort_within_partitions:
-            df = df.sortWithinPartitions("position")
-
-        writer = df.write.mode("overwrite").option("compression", args.compression)
-        if args.max_records_per_file is not None:
-            writer = writer.option("maxRecordsPerFile", args.max_records_per_file)
-
-        writer.parquet(str(out_contig_dir))
-        print(f"Wrote: {out_contig_dir}")
+        )
 
     print("Done.")
     return 0
@@ -37,30 +37,30 @@ def restructure_table(ht: hl.MatrixTable) -> hl.Table:
     return ht_out
 
 
-# Start with the first
-print(f"Reading first table from path: {local_paths[0]}")
-ht_union = hl.read_matrix_table(local_paths[0])
-ht_union = restructure_table(ht_union)
+tables = []
+for local_path in local_paths:
+    print(f"Reading table from path: {local_path}")
+    tables.append(restructure_table(hl.read_matrix_table(local_path)))
 
-# Union the rest
-for local_path in local_paths[1:]:
-    print(f"Unioning in table from path: {local_path}")
-    ht_to_union = hl.read_matrix_table(local_path)
-    ht_to_union = restructure_table(ht_to_union)
+# Union all contigs in one n-ary union rather than a left-deep chain of binary unions.
+# Contigs are disjoint by construction, so no per-step overlap check is needed.
+print(f"Unioning {len(tables)} tables")
+ht_union = tables[0].union(*tables[1:])
 
-    # Assert no overlap
-    assert ht_union.join(ht_to_union, how="inner").count() == 0
 
-    ht_union = ht_union.union(ht_to_union)
-
-
-print(f"Count of unioned table: {ht_union.count()}")
+# Single aggregate pass (map-side partial counts, no self-join) as a post-union sanity check.
+contig_counts = ht_union.aggregate(hl.agg.counter(ht_union.locus.contig))
+for contig in contigs:
+    print(f"Count for {contig}: {contig_counts.get(contig, 0)}")
+print(f"Count of unioned table: {sum(contig_counts.values())}")
 
 # Repartition unioned table with shuffle to redistribute
 # (current gnomad 4.1 genomes uses ~8k partitions)
 # EDIT: turning off shuffle since input tables are 1000 each
 # and so this is downsizing the partitions from 24000 to 10000
 # which does not benefit from shuffling as much.
+# Either way Hail partitions a keyed table by contiguous key (locus) ranges, never by hash,
+# so downstream hl.filter_intervals per contig only touches that contig's partitions.
 ht_union = ht_union.repartition(10000, shuffle=False)
 
 # Delete this dir if it exists
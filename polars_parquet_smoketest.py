@@ -12,14 +12,17 @@ Expected dataset layout:
 This script:
 - Scans the dataset lazily with Polars (no full materialization).
 - Filters to a contig (default: chrY).
-- Runs a few point and range position queries.
+- Runs a few point and range position queries (point counts and range queries can also run via
+  PyArrow or DuckDB with `--engine` to compare row-group pruning across readers).
 - Avoids whole-contig aggregates (only queries with position predicates).
 - Prints timing for each query so you can sanity-check pruning/perf.
 
 Requirements:
-  pip install polars
+  pip install numpy polars pyarrow
   # For gs:// datasets:
   pip install fsspec gcsfs
+  # For --engine duckdb:
+  pip install duckdb
 
 Usage:
   python3 polars_parquet_smoketest.py --dataset ./gnomad.genomes.v4.1.sites.VRS.parquet --contig chrY
@@ -35,38 +38,50 @@ How to use the dataset from DuckDB / Polars:
 
   Polars:
     import polars as pl
-    lf = pl.scan_parquet("parquet_out", hive_partitioning=True)
+    lf = pl.scan_parquet("parquet_out/**/*.parquet", hive_partitioning=True)
     lf.filter((pl.col("contig")=="chrY") & pl.col("position").is_between(20000000, 21000000)).collect()
 """
 
 from __future__ import annotations
 
 import argparse
+import json
+import operator
+import os
 import random
-import statistics
 import time
-from pathlib import Path
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import reduce
 from urllib.parse import urlparse
 
+import numpy as np
 import polars as pl
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+
+_BYTE_UNITS = ("B", "KiB", "MiB", "GiB", "TiB")
 
 
 def _human_bytes(num_bytes: int) -> str:
-    units = ["B", "KiB", "MiB", "GiB", "TiB"]
-    value = float(num_bytes)
-    for unit in units:
-        if value < 1024.0 or unit == units[-1]:
-            if unit == "B":
-                return f"{int(value)} {unit}"
-            return f"{value:.2f} {unit}"
-        value /= 1024.0
-    return f"{num_bytes} B"
+    # Pick the unit from the bit length (each unit is 2**10 larger) instead of repeated division.
+    unit_idx = min(len(_BYTE_UNITS) - 1, max(0, (num_bytes.bit_length() - 1) // 10))
+    if unit_idx == 0:
+        return f"{num_bytes} B"
+    return f"{num_bytes / (1 << (unit_idx * 10)):.2f} {_BYTE_UNITS[unit_idx]}"
 
 
-def _time_it(label: str, fn):
+def _timed(label: str, fn):
+    # Like `_time_it`, but returns (label, seconds, result) so worker threads can hand timings back
+    # to the main thread instead of printing out of order.
     t0 = time.perf_counter()
     out = fn()
-    dt = time.perf_counter() - t0
+    return label, time.perf_counter() - t0, out
+
+
+def _time_it(label: str, fn):
+    label, dt, out = _timed(label, fn)
     print(f"{label}: {dt:.3f}s")
     return out
 
@@ -83,6 +98,17 @@ def _collect(lf: pl.LazyFrame, *, streaming: bool) -> pl.DataFrame:
             return lf.collect()
 
 
+def _collect_all(lfs: list[pl.LazyFrame], *, streaming: bool) -> list[pl.DataFrame]:
+    # Same engine/streaming compatibility fallbacks as `_collect`.
+    try:
+        return pl.collect_all(lfs, engine="streaming" if streaming else "auto")
+    except TypeError:
+        try:
+            return pl.collect_all(lfs, streaming=streaming)
+        except TypeError:
+            return pl.collect_all(lfs)
+
+
 def _dataset_scheme(dataset: str) -> str:
     scheme = urlparse(dataset).scheme
     if scheme in ("", "file"):
@@ -111,12 +137,23 @@ def _contig_dir(dataset: str, contig: str | None) -> tuple[str, str]:
     return f"{dataset}/contig={contig}", contig
 
 
+def _walk_parquet(root: str) -> Iterator[os.DirEntry]:
+    # os.scandir reuses readdir's file type info, avoiding a stat(2) per entry for is_dir/is_file.
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".parquet") and entry.is_file():
+                    yield entry
+
+
 def _list_parquet_files(contig_dir: str, *, scheme: str) -> list[str]:
     if scheme == "local":
-        contig_path = Path(contig_dir)
-        if not contig_path.exists():
-            raise SystemExit(f"Path does not exist: {contig_path}")
-        return sorted(str(p) for p in contig_path.rglob("*.parquet") if p.is_file())
+        if not os.path.exists(contig_dir):
+            raise SystemExit(f"Path does not exist: {contig_dir}")
+        return sorted(entry.path for entry in _walk_parquet(contig_dir))
 
     if scheme == "gs":
         try:
@@ -141,24 +178,111 @@ def _list_parquet_files(contig_dir: str, *, scheme: str) -> list[str]:
     raise AssertionError(f"Unhandled scheme: {scheme}")
 
 
-def _local_parquet_file_stats(*, contig_dir: str, parquet_files: list[str]) -> None:
-    if not parquet_files:
+def _scan_contig(source: str | list[str]) -> pl.LazyFrame:
+    # Every query here has a selective `position` predicate, which is what the "prefiltered" strategy
+    # targets: evaluate the predicate first and decode other columns only for matching rows.
+    return pl.scan_parquet(
+        source,
+        hive_partitioning=True,
+        hive_schema={"contig": pl.String},
+        parallel="prefiltered",
+        use_statistics=True,
+    )
+
+
+def _load_manifest(contig_dir: str, *, scheme: str) -> dict[str, dict] | None:
+    """
+    Return the exporter's `_manifest.json` file entries for `contig_dir`, or None if there is none.
+
+    Entries map file paths (relative to `contig_dir`) to {"min", "max", "num_rows"} of `position`.
+    """
+    manifest_path = f"{contig_dir}/_manifest.json"
+    try:
+        if scheme == "local":
+            with open(manifest_path) as f:
+                return json.load(f)["files"]
+
+        try:
+            import fsspec  # type: ignore[import-not-found]
+        except ImportError as e:
+            raise SystemExit(
+                "gs:// support requires fsspec + gcsfs: pip install fsspec gcsfs"
+            ) from e
+        with fsspec.open(manifest_path, "r") as f:
+            return json.load(f)["files"]
+    except FileNotFoundError:
+        return None
+
+
+def _prune_files_via_manifest(
+    manifest_files: dict[str, dict], contig_dir: str, start: int, end: int
+) -> list[str]:
+    """
+    Return the files under `contig_dir` whose manifest position range overlaps [start, end].
+
+    Files with unknown ranges are always kept.
+    """
+    return [
+        f"{contig_dir}/{name}"
+        for name, stats in manifest_files.items()
+        if stats["min"] is None
+        or stats["max"] is None
+        or (stats["min"] <= end and stats["max"] >= start)
+    ]
+
+
+def _local_parquet_file_stats(*, contig_dir: str) -> None:
+    sizes = np.fromiter(
+        (entry.stat().st_size for entry in _walk_parquet(contig_dir)), dtype=np.int64
+    )
+    if sizes.size == 0:
         print(f"No parquet files found under: {contig_dir}")
         return
 
-    sizes = [Path(p).stat().st_size for p in parquet_files]
-    total = sum(sizes)
-    print(f"Parquet files under {contig_dir}: {len(parquet_files)}")
+    # O(n) selection instead of a full sort for the median.
+    p50 = int(np.partition(sizes, sizes.size // 2)[sizes.size // 2])
+    print(f"Parquet files under {contig_dir}: {sizes.size}")
     print(
         "File sizes:",
-        f"total={_human_bytes(total)}",
-        f"min={_human_bytes(min(sizes))}",
-        f"p50={_human_bytes(int(statistics.median(sizes)))}",
-        f"max={_human_bytes(max(sizes))}",
+        f"total={_human_bytes(int(sizes.sum()))}",
+        f"min={_human_bytes(int(sizes.min()))}",
+        f"p50={_human_bytes(p50)}",
+        f"max={_human_bytes(int(sizes.max()))}",
         sep=" ",
     )
 
 
+def _row_group_position_bounds(path: str) -> list[int] | None:
+    """
+    Return the min and max `position` of every row group in `path`, read from the Parquet footer only.
+
+    Returns None if the footer lacks usable `position` statistics.
+    """
+    metadata = pq.read_metadata(path)
+    if metadata.num_row_groups == 0:
+        return []
+
+    first_rg = metadata.row_group(0)
+    position_idx = next(
+        (
+            i
+            for i in range(first_rg.num_columns)
+            if first_rg.column(i).path_in_schema == "position"
+        ),
+        None,
+    )
+    if position_idx is None:
+        return None
+
+    positions: list[int] = []
+    for rg_idx in range(metadata.num_row_groups):
+        stats = metadata.row_group(rg_idx).column(position_idx).statistics
+        if stats is None or not stats.has_min_max:
+            return None
+        positions.extend((int(stats.min), int(stats.max)))
+    return positions
+
+
 def _sample_existing_positions_from_files(
     parquet_files: list[str],
     *,
@@ -169,8 +293,9 @@ def _sample_existing_positions_from_files(
     """
     Return a list of positions known to exist in the dataset by sampling a small number of files.
 
-    This avoids sampling via a full-table scan. Distribution depends on how the exporter laid out
-    positions across files; for keyed-by-locus datasets this is usually "good enough".
+    Positions come from row-group min/max statistics in each file's footer, so no data pages are
+    decompressed. Row-group min/max values are actual column values, so they are guaranteed to exist.
+    Files without statistics fall back to decoding the first `n_rows_per_file` positions.
     """
     if not parquet_files:
         return []
@@ -179,22 +304,270 @@ def _sample_existing_positions_from_files(
     n_files = min(n_files, len(parquet_files))
     sampled_files = rng.sample(parquet_files, n_files)
 
-    positions: list[int] = []
-    for path in sampled_files:
+    def _footer_bounds(path: str) -> list[int] | None:
         try:
-            df = pl.read_parquet(path, columns=["position"], n_rows=n_rows_per_file)
+            return _row_group_position_bounds(path)
         except Exception:
             # Skip unreadable/corrupt files without failing the smoke test.
-            continue
-        if df.is_empty():
-            continue
-        positions.extend(
-            int(x) for x in df.get_column("position").to_list() if x is not None
-        )
+            return []
+
+    # Footer reads are independent and I/O-bound (PyArrow releases the GIL), so overlap them.
+    positions: list[int] = []
+    no_stats_files: list[str] = []
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for path, bounds in zip(sampled_files, pool.map(_footer_bounds, sampled_files)):
+            if bounds is None:
+                no_stats_files.append(path)
+            else:
+                positions.extend(bounds)
+
+    if no_stats_files:
+        # Decode the fallback files concurrently (Polars releases the GIL), but collect each one on
+        # its own so a single unreadable file doesn't drop the others' positions.
+        def _decoded_positions(path: str) -> list[int]:
+            lf = pl.scan_parquet(path, n_rows=n_rows_per_file).select("position").drop_nulls()
+            try:
+                df = _collect(lf, streaming=False)
+            except Exception:
+                # Skip unreadable/corrupt files without failing the smoke test.
+                return []
+            return df.get_column("position").to_numpy().tolist()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            for file_positions in pool.map(_decoded_positions, no_stats_files):
+                positions.extend(file_positions)
 
     return positions
 
 
+def _duckdb_connect():
+    try:
+        import duckdb  # type: ignore[import-not-found]
+    except ImportError as e:
+        raise SystemExit("--engine duckdb requires duckdb: pip install duckdb") from e
+    return duckdb.connect()
+
+
+def _polars_point_queries(
+    lf_contig: pl.LazyFrame,
+    positions: list[int],
+    *,
+    example_cols: list[str],
+    limit: int,
+    streaming: bool,
+) -> tuple[pl.DataFrame, pl.DataFrame | None]:
+    """
+    Run the point-query counts and examples for all `positions`.
+
+    Examples are collected first with up to `limit + 1` rows per position; positions with at most
+    `limit` matches get their count from those rows directly, and only denser positions need a
+    second, count-only query. Sparse positions (the common case) therefore cost a single scan.
+    Returns (counts, examples): counts is (position, n_rows) sorted by position; examples holds up
+    to `limit` rows per position, or is None when `limit` is 0.
+    """
+    example_cols = list(dict.fromkeys(["position", *example_cols]))
+    sample = _collect(
+        lf_contig.filter(pl.col("position").is_in(positions))
+        .select(example_cols)
+        .group_by("position", maintain_order=True)
+        .head(limit + 1)
+        .sort("position"),
+        streaming=streaming,
+    )
+    sample_counts = sample.group_by("position").agg(pl.len().alias("n_rows"))
+
+    dense = sample_counts.filter(pl.col("n_rows") > limit).get_column("position")
+    counts = sample_counts.filter(pl.col("n_rows") <= limit)
+    if dense.len() > 0:
+        dense_counts = _collect(
+            lf_contig.select("position")
+            .filter(pl.col("position").is_in(dense.to_list()))
+            .group_by("position")
+            .agg(pl.len().alias("n_rows")),
+            streaming=streaming,
+        )
+        counts = pl.concat([counts, dense_counts])
+
+    examples = (
+        sample.group_by("position", maintain_order=True).head(limit)
+        if limit > 0
+        else None
+    )
+    return counts.sort("position"), examples
+
+
+def _point_count_fn(
+    engine: str,
+    *,
+    contig_dir: str,
+) -> Callable[[list[int]], pl.DataFrame]:
+    """
+    Return a function counting rows per position for a batch of point positions (pyarrow or duckdb).
+
+    Returns a Polars DataFrame of (position, n_rows) sorted by position. DuckDB can answer these
+    counts from row-group/page statistics and skip decoding where Polars decodes matching pages.
+    """
+    if engine == "pyarrow":
+        dataset = ds.dataset(contig_dir, format="parquet")
+
+        def count(positions: list[int]) -> pl.DataFrame:
+            tbl = dataset.to_table(
+                columns=["position"], filter=ds.field("position").isin(positions)
+            )
+            return (
+                pl.from_arrow(tbl)
+                .group_by("position")
+                .agg(pl.len().alias("n_rows"))
+                .sort("position")
+            )
+
+        return count
+
+    if engine == "duckdb":
+        con = _duckdb_connect()
+        parquet_glob = f"{contig_dir}/**/*.parquet"
+
+        def count(positions: list[int]) -> pl.DataFrame:
+            placeholders = ", ".join("?" for _ in positions)
+            return con.execute(
+                "SELECT position, count(*) AS n_rows FROM read_parquet(?) "
+                f"WHERE position IN ({placeholders}) GROUP BY position ORDER BY position",
+                [parquet_glob, *positions],
+            ).pl()
+
+        return count
+
+    raise AssertionError(f"Unhandled engine: {engine}")
+
+
+def _polars_range_queries(
+    lf_contig: pl.LazyFrame,
+    ranges: list[tuple[int, int]],
+    *,
+    contig_dir: str,
+    manifest_files: dict[str, dict] | None,
+    example_cols: list[str],
+    limit: int,
+    streaming: bool,
+) -> tuple[pl.DataFrame, pl.DataFrame | None]:
+    """
+    Run all `position` range queries in a single Polars scan filtered on the OR of the ranges.
+
+    Each row is tagged with the ids of every range containing it (ranges may overlap), then counted
+    and sampled per range. Returns (counts, examples): counts has one row per range with columns
+    (range_id, start, end, n_rows); examples holds up to `limit` rows per range, or is None when
+    there is nothing to show.
+    """
+    lf = lf_contig
+    if manifest_files is not None:
+        files = sorted(
+            {
+                f
+                for start, end in ranges
+                for f in _prune_files_via_manifest(manifest_files, contig_dir, start, end)
+            }
+        )
+        lf = _scan_contig(files) if files else lf_contig.clear()
+
+    in_range = [pl.col("position").is_between(start, end) for start, end in ranges]
+    range_ids = pl.concat_list(
+        [
+            pl.when(pred).then(pl.lit(i, dtype=pl.UInt32))
+            for i, pred in enumerate(in_range)
+        ]
+    ).list.drop_nulls()
+    lf_tagged = (
+        lf.select(list(dict.fromkeys(["position", *example_cols])))
+        # OR of the per-range predicates, so row-group statistics prune the gaps between ranges
+        # rather than only what lies outside the overall span.
+        .filter(reduce(operator.or_, in_range))
+        .with_columns(range_id=range_ids)
+        .explode("range_id")
+        .drop_nulls("range_id")
+    )
+
+    ranges_df = pl.DataFrame(
+        {
+            "range_id": list(range(len(ranges))),
+            "start": [start for start, _ in ranges],
+            "end": [end for _, end in ranges],
+        },
+        schema={"range_id": pl.UInt32, "start": pl.Int64, "end": pl.Int64},
+    )
+    queries = [lf_tagged.group_by("range_id").agg(pl.len().alias("n_rows"))]
+    if example_cols and limit > 0:
+        queries.append(
+            lf_tagged.select("range_id", *example_cols)
+            .group_by("range_id", maintain_order=True)
+            .head(limit)
+            .sort("range_id")
+        )
+
+    results = _collect_all(queries, streaming=streaming)
+    counts = (
+        ranges_df.join(results[0], on="range_id", how="left")
+        .with_columns(pl.col("n_rows").fill_null(0))
+        .sort("range_id")
+    )
+    examples = results[1] if len(results) > 1 else None
+    return counts, examples
+
+
+def _range_query_fns(
+    engine: str,
+    *,
+    contig_dir: str,
+    example_cols: list[str],
+    limit: int,
+) -> tuple[Callable[[int, int], pl.DataFrame], Callable[[int, int], pl.DataFrame]]:
+    """
+    Return per-range (count, examples) query functions for the pyarrow or duckdb engine.
+
+    Both return Polars DataFrames so results print the same way as the batched Polars path
+    (`_polars_range_queries`), and benchmark their own row-group pruning on the same files.
+    """
+    if engine == "pyarrow":
+        dataset = ds.dataset(contig_dir, format="parquet")
+        # The dataset is rooted at contig=<contig>/, so PyArrow exposes no hive `contig` column.
+        pa_example_cols = [c for c in example_cols if c in dataset.schema.names]
+
+        def _range_filter(start: int, end: int) -> ds.Expression:
+            return (ds.field("position") >= start) & (ds.field("position") <= end)
+
+        def count(start: int, end: int) -> pl.DataFrame:
+            n_rows = dataset.count_rows(filter=_range_filter(start, end))
+            return pl.DataFrame({"n_rows": [n_rows]})
+
+        def examples(start: int, end: int) -> pl.DataFrame:
+            return pl.from_arrow(
+                dataset.head(limit, columns=pa_example_cols, filter=_range_filter(start, end))
+            )
+
+        return count, examples
+
+    if engine == "duckdb":
+        con = _duckdb_connect()
+        parquet_glob = f"{contig_dir}/**/*.parquet"
+        select_cols = ", ".join(f'"{c}"' for c in example_cols)
+
+        # A DuckDB connection must not be shared across threads; each query gets its own cursor.
+        def count(start: int, end: int) -> pl.DataFrame:
+            return con.cursor().execute(
+                "SELECT count(*) AS n_rows FROM read_parquet(?) WHERE position BETWEEN ? AND ?",
+                [parquet_glob, start, end],
+            ).pl()
+
+        def examples(start: int, end: int) -> pl.DataFrame:
+            return con.cursor().execute(
+                f"SELECT {select_cols} FROM read_parquet(?) WHERE position BETWEEN ? AND ? LIMIT ?",
+                [parquet_glob, start, end, limit],
+            ).pl()
+
+        return count, examples
+
+    raise AssertionError(f"Unhandled engine: {engine}")
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="Polars smoke test for contig-partitioned Parquet."
@@ -231,7 +604,10 @@ def main() -> int:
         "--rows-per-file-sample",
         type=int,
         default=100,
-        help="How many rows to read from each sampled parquet file (default: 100).",
+        help=(
+            "How many rows to read from each sampled parquet file when its footer has no position "
+            "statistics (default: 100)."
+        ),
     )
     parser.add_argument(
         "--n-range-queries",
@@ -251,6 +627,30 @@ def main() -> int:
         default=5,
         help="Max rows to print for example queries (default: 5).",
     )
+    parser.add_argument(
+        "--engine",
+        choices=["polars", "pyarrow", "duckdb"],
+        default="polars",
+        help=(
+            "Engine used for point counts and range queries (default: polars). pyarrow/duckdb let you "
+            "compare row-group pruning on the same files; duckdb requires `pip install duckdb`. "
+            "Point-query example rows always use Polars."
+        ),
+    )
+    parser.add_argument(
+        "--query-threads",
+        type=int,
+        default=1,
+        help=(
+            "Run per-range queries for --engine pyarrow/duckdb concurrently on this many threads "
+            "(default: 1). Polars already answers all ranges in one batched scan."
+        ),
+    )
+    parser.add_argument(
+        "--ignore-manifest",
+        action="store_true",
+        help="Don't use the exporter's _manifest.json to prune files for Polars range queries.",
+    )
     parser.add_argument(
         "--no-streaming",
         action="store_true",
@@ -262,6 +662,8 @@ def main() -> int:
         help="Print local-only parquet file size stats (ignored for gs://).",
     )
     args = parser.parse_args()
+    if args.query_threads < 1:
+        parser.error("--query-threads must be >= 1")
 
     dataset = args.dataset
     parsed = urlparse(dataset)
@@ -270,23 +672,35 @@ def main() -> int:
         dataset = parsed.path
 
     contig_dir, contig = _contig_dir(dataset, args.contig)
+    # Listing is only needed for file sampling and --local-file-stats; the scan below uses a glob.
     parquet_files = _list_parquet_files(contig_dir, scheme=scheme)
     if not parquet_files:
         raise SystemExit(f"No parquet files found under: {contig_dir}")
 
     if args.local_file_stats:
         if scheme == "local":
-            _local_parquet_file_stats(contig_dir=contig_dir, parquet_files=parquet_files)
+            _local_parquet_file_stats(contig_dir=contig_dir)
         else:
             print("--local-file-stats is only supported for local filesystem paths; skipping.")
 
-    lf = pl.scan_parquet(parquet_files, hive_partitioning=True)
+    # Only the batched Polars range queries prune files with the manifest.
+    manifest_files = (
+        _load_manifest(contig_dir, scheme=scheme)
+        if args.engine == "polars" and not args.ignore_manifest
+        else None
+    )
+    if manifest_files is not None:
+        print(f"{contig}: using _manifest.json ({len(manifest_files)} files) for range queries")
+
+    # Point the scan directly at the contig's partition directory rather than filtering on the hive
+    # `contig` column: no partition pruning is needed, and Polars' hive predicate pushdown has
+    # historically been unreliable.
+    lf_contig = _scan_contig(f"{contig_dir}/**/*.parquet")
 
-    schema = lf.collect_schema()
+    schema = lf_contig.collect_schema()
     if "position" not in schema:
         raise SystemExit("No 'position' column found in Parquet dataset.")
 
-    lf_contig = lf.filter(pl.col("contig") == contig) if "contig" in schema else lf
     streaming = not args.no_streaming
 
     # Choose a random assortment of existing positions (guaranteed to exist) without manual input.
@@ -297,7 +711,13 @@ def main() -> int:
         seed=args.seed,
     )
 
-    candidate_positions_list = sorted({int(p) for p in file_sample_positions})
+    # Dedupe + sort in one native call instead of building a Python set and sorting it.
+    candidate_positions_arr = np.unique(
+        np.fromiter(
+            file_sample_positions, dtype=np.int64, count=len(file_sample_positions)
+        )
+    )
+    candidate_positions_list = candidate_positions_arr.tolist()
     if not candidate_positions_list:
         raise SystemExit(
             f"No positions sampled for contig {contig}. Try increasing --sample-files and/or --rows-per-file-sample."
@@ -312,46 +732,59 @@ def main() -> int:
 
     n_point_queries = max(0, int(args.n_point_queries))
     if n_point_queries > 0:
-        rng = random.Random(args.seed)
-        point_positions: list[int] = [sampled_min]
-        if sampled_max != sampled_min:
-            point_positions.append(sampled_max)
-        remaining = [p for p in candidate_positions_list if p not in point_positions]
-        rng.shuffle(remaining)
-        point_positions.extend(
-            remaining[: max(0, n_point_queries - len(point_positions))]
-        )
-        point_positions = sorted(set(point_positions))[:n_point_queries]
+        # Always include the sampled extremes, then fill with a seeded shuffle of the rest.
+        fixed = np.unique(np.array([sampled_min, sampled_max], dtype=np.int64))
+        remaining = np.setdiff1d(candidate_positions_arr, fixed, assume_unique=True)
+        np.random.default_rng(args.seed).shuffle(remaining)
+        point_positions = np.unique(
+            np.concatenate(
+                [fixed, remaining[: max(0, n_point_queries - fixed.size)]]
+            )
+        )[:n_point_queries].tolist()
     else:
         point_positions = []
 
     print(f"{contig}: point query positions ({len(point_positions)}): {point_positions}")
 
-    # Point queries (positions guaranteed to exist).
-    for pos in point_positions:
-        count_df = _time_it(
-            f"{contig}: point count position={pos}",
-            lambda pos=pos: _collect(
-                lf_contig.filter(pl.col("position") == pos).select(
-                    pl.len().alias("n_rows")
-                ),
+    # Invariant across all queries below; only the filter expression varies per query.
+    example_cols = [
+        c for c in ("contig", "position", "alleles", "VRS_Allele_IDs") if c in schema
+    ]
+
+    # Point queries (positions guaranteed to exist), batched into one scan so parquet footers are
+    # opened and row groups pruned once for all positions rather than once per position.
+    if point_positions and args.engine == "polars":
+        count_df, examples = _time_it(
+            f"{contig}: point counts+examples n={len(point_positions)} (polars, batched)",
+            lambda: _polars_point_queries(
+                lf_contig,
+                point_positions,
+                example_cols=example_cols,
+                limit=args.limit,
                 streaming=streaming,
             ),
         )
         print(count_df)
+        if examples is not None:
+            print(examples)
+    elif point_positions:
+        point_count_fn = _point_count_fn(args.engine, contig_dir=contig_dir)
+        count_df = _time_it(
+            f"{contig}: point counts n={len(point_positions)} ({args.engine})",
+            lambda: point_count_fn(point_positions),
+        )
+        print(count_df)
 
-        example_cols = [
-            c
-            for c in ["contig", "position", "alleles", "VRS_Allele_IDs"]
-            if c in schema
-        ]
-        if example_cols:
+        # Example rows need actual values, so they always come from Polars.
+        if example_cols and args.limit > 0:
             examples = _time_it(
-                f"{contig}: examples position={pos}",
-                lambda pos=pos: _collect(
-                    lf_contig.filter(pl.col("position") == pos)
+                f"{contig}: examples positions n={len(point_positions)}",
+                lambda: _collect(
+                    lf_contig.filter(pl.col("position").is_in(point_positions))
                     .select(example_cols)
-                    .limit(args.limit),
+                    .group_by("position", maintain_order=True)
+                    .head(args.limit)
+                    .sort("position"),
                     streaming=streaming,
                 ),
             )
@@ -363,45 +796,73 @@ def main() -> int:
         range_width = max(1, int(args.range_width))
 
         # Choose range centers at roughly-even quantiles of known-existing positions to ensure hits.
-        idxs = [
-            round(i * (len(candidate_positions_list) - 1) / max(1, n_range_queries - 1))
-            for i in range(n_range_queries)
-        ]
-        range_centers = [candidate_positions_list[i] for i in idxs]
+        idxs = (
+            np.linspace(0, candidate_positions_arr.size - 1, n_range_queries)
+            .round()
+            .astype(np.int64)
+        )
+        range_centers = candidate_positions_arr[idxs].tolist()
 
-        print(f"{contig}: range queries n={n_range_queries} width={range_width}")
+        ranges: list[tuple[int, int]] = []
         for center in range_centers:
             start = max(sampled_min, center - range_width // 2)
             end = min(sampled_max, start + range_width - 1)
             start = max(sampled_min, min(start, end))
+            ranges.append((start, end))
 
-            range_count = _time_it(
-                f"{contig}: range count {start}-{end}",
-                lambda start=start, end=end: _collect(
-                    lf_contig.filter(pl.col("position").is_between(start, end)).select(
-                        pl.len().alias("n_rows")
-                    ),
+        print(f"{contig}: range queries n={n_range_queries} width={range_width}")
+        if args.engine == "polars":
+            # One scan for every range instead of a count + examples scan per range.
+            range_counts, range_examples = _time_it(
+                f"{contig}: range counts+examples n={len(ranges)} (polars, batched)",
+                lambda: _polars_range_queries(
+                    lf_contig,
+                    ranges,
+                    contig_dir=contig_dir,
+                    manifest_files=manifest_files,
+                    example_cols=example_cols,
+                    limit=args.limit,
                     streaming=streaming,
                 ),
             )
-            print(range_count)
-
-            example_cols = [
-                c
-                for c in ["contig", "position", "alleles", "VRS_Allele_IDs"]
-                if c in schema
-            ]
-            if example_cols and args.limit > 0:
-                examples = _time_it(
-                    f"{contig}: examples range {start}-{end}",
-                    lambda start=start, end=end: _collect(
-                        lf_contig.filter(pl.col("position").is_between(start, end))
-                        .select(example_cols)
-                        .limit(args.limit),
-                        streaming=streaming,
-                    ),
-                )
-                print(examples)
+            print(range_counts)
+            if range_examples is not None:
+                print(range_examples)
+        else:
+            range_count_fn, range_examples_fn = _range_query_fns(
+                args.engine,
+                contig_dir=contig_dir,
+                example_cols=example_cols,
+                limit=args.limit,
+            )
+
+            def _run_range(
+                bounds: tuple[int, int],
+            ) -> list[tuple[str, float, pl.DataFrame]]:
+                start, end = bounds
+                results = [
+                    _timed(
+                        f"{contig}: range count {start}-{end} ({args.engine})",
+                        lambda: range_count_fn(start, end),
+                    )
+                ]
+                if example_cols and args.limit > 0:
+                    results.append(
+                        _timed(
+                            f"{contig}: examples range {start}-{end} ({args.engine})",
+                            lambda: range_examples_fn(start, end),
+                        )
+                    )
+                return results
+
+            # Both engines release the GIL while scanning, so independent range queries can overlap
+            # their I/O. Workers only time their queries; each timing is printed next to its table,
+            # in query order.
+            with ThreadPoolExecutor(max_workers=args.query_threads) as pool:
+                for results in pool.map(_run_range, ranges):
+                    for label, dt, df in results:
+                        print(f"{label}: {dt:.3f}s")
+                        print(df)
 
     return 0
 
@@ -7,6 +7,7 @@ Spark will try to spill memory to /tmp which may be too small.
 
 """
 
+import os
 import shutil
 import subprocess
 from pathlib import Path
@@ -26,6 +27,8 @@ hl.init(
         # Running on 16GiB RAM vm, so allocate 6g to driver and executor each.
         "spark.driver.memory": "6g",
         "spark.executor.memory": "6g",
+        # Larger GCS connector upload chunks for direct gs:// writes (fewer, bigger requests).
+        "spark.hadoop.fs.gs.outputstream.upload.chunk.size": str(64 * 1024 * 1024),
     },
 )
 
@@ -33,6 +36,10 @@ bucket = "kferrite-sandbox-storage"
 source = "exomes"  # "genomes" or "exomes"
 vcf_prefix = "vcf-vrs-fixed"
 ht_prefix = "ht-vrs"
+# Persist the table locally and upload it with gcloud (default). Set to True to write straight to
+# GCS from the executors via the hadoop GCS connector instead, skipping the local copy; this needs
+# the connector configured on the cluster.
+write_direct_to_gcs = False
 
 output_ht_url = f"gs://{bucket}/{ht_prefix}/gnomad.{source}.v4.1.sites.VRS.ht/"
 # vcf_url_templ = (
@@ -40,6 +47,7 @@ output_ht_url = f"gs://{bucket}/{ht_prefix}/gnomad.{source}.v4.1.sites.VRS.ht/"
 # )
 vcf_url_templ = f"./{vcf_prefix}/gnomad.{source}.v4.1.sites.chr{{}}.VRS.vcf.bgz"
 contigs = [str(i) for i in range(1, 23)] + ["X", "Y"]
+target_partitions = 10000
 
 vcf_gcs_urls = [vcf_url_templ.format(contig) for contig in contigs]
 
@@ -47,73 +55,74 @@ vcf_gcs_urls = [vcf_url_templ.format(contig) for contig in contigs]
 def restructure_table(ht: hl.MatrixTable) -> hl.Table:
     """
     Convert MatrixTable to Table with only the locus, alleles, and info field.
-    Drop the .info.VRS_Error field since it's empty for gnomad since there
-    are no invalid values such as positions or sequences or refs or expressions.
     """
     ht_out = ht.rows()
     ht_out = ht_out.key_by("locus", "alleles")
     ht_out = ht_out.select("info")
-    # Drop .info.VRS_Error since they're all empty for the gnomad use case
-    if "VRS_Error" in ht_out.info.dtype.fields:
-        ht_out = ht_out.annotate(info=ht_out.info.drop("VRS_Error"))
     return ht_out
 
 
-def import_vcf_to_hail(vcf_gcs_url: str) -> hl.Table:
+def import_vcf_to_hail(vcf_gcs_urls: list[str], min_partitions: int) -> hl.Table:
+    # A single import over all paths lets Hail decode the bgz files in parallel across executors
+    # and yields one table, instead of a left-deep chain of per-contig unions.
     matrix_table = hl.import_vcf(
-        vcf_gcs_url,
+        vcf_gcs_urls,
         reference_genome="GRCh38",
         force_bgz=True,
         array_elements_required=False,
+        min_partitions=min_partitions,
     )
+    # Drop .info.VRS_Error right at import since it's empty for gnomad (there are no invalid
+    # values such as positions or sequences or refs or expressions), so it is never carried
+    # through the later stages and write.
+    if "VRS_Error" in matrix_table.info.dtype.fields:
+        matrix_table = matrix_table.annotate_rows(
+            info=matrix_table.info.drop("VRS_Error")
+        )
     ht = restructure_table(matrix_table)
     return ht
 
 
-union_table: hl.Table = None
-
-# Import and restructure
-for vcf_gcs_url in vcf_gcs_urls:
-    print("Processing VCF GCS URL:", vcf_gcs_url)
-    df = import_vcf_to_hail(vcf_gcs_url)
-    # df = df.repartition(10)
-
-    if union_table is None:
-        union_table = df
-    else:
-        # Assert no overlap
-        # assert union_table.join(df, how="inner").count() == 0
-        print("Unioning in table from URL:", vcf_gcs_url)
-        union_table = union_table.union(df)
-
-# Repartition unioned table with shuffle to redistribute
-# (current gnomad 4.1 genomes uses ~8k partitions)
-union_table = union_table.repartition(10000, shuffle=True)
-
-# Export table locally
-local_path = f"gnomad.{source}.v4.1.sites.VRS.ht"
-print("Persisting hail table locally to path:", local_path)
-if Path(local_path).exists():
-    shutil.rmtree(local_path)
-union_table.write(local_path, overwrite=True)
-
-# Read back from persisted local table. Just a sanity check.
-union_table = hl.read_table(local_path)
-print("Count of persisted unioned table:", union_table.count())
-
-# rsync table to GCS
-print("Writing persisted Hail Table to GCS path:", output_ht_url)
-
-# Wipe out any existing files at that prefix with --delete-unmatched-destination-objects (careful!)
-subprocess.run(
-    [
-        "gcloud",
-        "storage",
-        "rsync",
-        "-r",
-        "--delete-unmatched-destination-objects",
-        f"./{local_path}/",
-        output_ht_url,
-    ],
-    check=True,
-)
+print("Importing VCF URLs:", *vcf_gcs_urls, sep="\n  ")
+# Set the partition count at import (split on bgzip block boundaries) rather than with a
+# full shuffle repartition afterwards (current gnomad 4.1 genomes uses ~8k partitions).
+union_table = import_vcf_to_hail(vcf_gcs_urls, min_partitions=target_partitions)
+
+if write_direct_to_gcs:
+    print("Writing Hail Table directly to GCS path:", output_ht_url)
+    union_table.write(output_ht_url, overwrite=True)
+else:
+    # Export table locally
+    local_path = f"gnomad.{source}.v4.1.sites.VRS.ht"
+    print("Persisting hail table locally to path:", local_path)
+    if Path(local_path).exists():
+        shutil.rmtree(local_path)
+    union_table.write(local_path, overwrite=True)
+
+    # Sanity check from metadata only; a count() here would scan every partition again.
+    assert (Path(local_path) / "_SUCCESS").exists(), f"Incomplete write: {local_path}"
+    print("Partitions in persisted table:", hl.read_table(local_path).n_partitions())
+
+    # rsync table to GCS
+    print("Writing persisted Hail Table to GCS path:", output_ht_url)
+
+    # Wipe out any existing files at that prefix with --delete-unmatched-destination-objects (careful!)
+    subprocess.run(
+        [
+            "gcloud",
+            "storage",
+            "rsync",
+            "-r",
+            "--delete-unmatched-destination-objects",
+            f"./{local_path}/",
+            output_ht_url,
+        ],
+        # A Hail table is thousands of small part files, so per-request latency dominates;
+        # raise gcloud's upload parallelism to keep many uploads in flight.
+        env={
+            **os.environ,
+            "CLOUDSDK_STORAGE_PROCESS_COUNT": "8",
+            "CLOUDSDK_STORAGE_THREAD_COUNT": "16",
+        },
+        check=True,
+    )